@@ -24,6 +24,8 @@ class Role(StrEnum):
 
 
 class Severity(StrEnum):
+    rank: int  # ordinal escalation rank, assigned below
+
     info = "info"
     caution = "caution"
     major = "major"
@@ -36,8 +38,25 @@ class Domain(StrEnum):
 
 
 class RuleClass(StrEnum):
+    rank: int  # ordinal escalation rank, assigned below
+
     avoid = "avoid"
     adjust_monitor = "adjust_monitor"
     caution = "caution"
     info = "info"
 
+
+# Shared ordinal ranks for severity/rule-class comparisons. These stay
+# StrEnums so their values keep serializing as strings (JSON, DB, CLI); the
+# rank attribute gives callers an integer ordering without per-module lookup
+# tables. Severity declaration order matches its escalation order.
+for _sev_rank, _sev in enumerate(Severity):
+    _sev.rank = _sev_rank
+
+for _cls_rank, _cls in enumerate(
+    (RuleClass.info, RuleClass.caution, RuleClass.adjust_monitor, RuleClass.avoid)
+):
+    _cls.rank = _cls_rank
+
+del _sev_rank, _sev, _cls_rank, _cls
+
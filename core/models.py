@@ -52,7 +52,7 @@ class Facts:
     patient_flags: dict[str, bool] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class RuleHit:
     rule_id: str
     name: str
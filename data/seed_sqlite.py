@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import sqlite3
 from pathlib import Path
 
@@ -11,16 +12,31 @@ DB_PATH = BASE_DIR / "data" / "pharmds.sqlite3"
 SCHEMA_PATH = BASE_DIR / "data" / "schema.sql"
 
 
-def connect(db_path: Path) -> sqlite3.Connection:
+def connect(db_path: Path | str) -> sqlite3.Connection:
     conn = sqlite3.connect(str(db_path))
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
     return conn
 
 
+def _schema_version(raw: bytes) -> int:
+    # PRAGMA user_version holds a 32-bit signed int; fold the schema hash into it
+    # so a changed schema.sql forces a re-apply.
+    digest = hashlib.sha256(raw).digest()
+    return int.from_bytes(digest[:4], "big") & 0x7FFFFFFF
+
+
 def apply_schema(conn: sqlite3.Connection) -> None:
-    sql = SCHEMA_PATH.read_text(encoding="utf-8")
-    conn.executescript(sql)
+    raw = SCHEMA_PATH.read_bytes()
+    version = _schema_version(raw)
+
+    (current,) = conn.execute("PRAGMA user_version").fetchone()
+    if current == version:
+        # Schema already applied from this exact schema.sql; skip re-parsing DDL.
+        return
+
+    conn.executescript(raw.decode("utf-8"))
+    conn.execute(f"PRAGMA user_version = {version}")
     conn.commit()
 
 
@@ -67,8 +83,9 @@ def seed(conn: sqlite3.Connection) -> None:
             "Phase II glucuronidation enzyme; relevant for some opioids (educational).",
         ),
     ]
-    for e in enzymes:
-        upsert(conn, "INSERT OR REPLACE INTO enzyme(id,family,description) VALUES(?,?,?)", e)
+    conn.executemany(
+        "INSERT OR REPLACE INTO enzyme(id,family,description) VALUES(?,?,?)", enzymes
+    )
 
     # Transporters (lookup)
     transporters = [
@@ -81,8 +98,9 @@ def seed(conn: sqlite3.Connection) -> None:
         ("SERT", "Serotonin transporter (SLC6A4); relevant for serotonergic drugs."),
         ("NET", "Norepinephrine transporter (SLC6A2); relevant for some antidepressants."),
     ]
-    for t in transporters:
-        upsert(conn, "INSERT OR REPLACE INTO transporter(id,description) VALUES(?,?)", t)
+    conn.executemany(
+        "INSERT OR REPLACE INTO transporter(id,description) VALUES(?,?)", transporters
+    )
 
     # PD effects
     pd_ids = {v for k, v in vars(c).items() if k.startswith("PD_EFFECT_")}
@@ -97,8 +115,10 @@ def seed(conn: sqlite3.Connection) -> None:
         "seizure_risk",
     }
 
-    for eid in sorted(pd_ids):
-        upsert(conn, "INSERT OR IGNORE INTO pd_effect(id,description) VALUES(?,?)", (eid, ""))
+    conn.executemany(
+        "INSERT OR IGNORE INTO pd_effect(id,description) VALUES(?,?)",
+        [(eid, "") for eid in sorted(pd_ids)],
+    )
 
     # Optional: override descriptions for a curated subset (keeps DB more readable)
     pd_effect_descriptions = [
@@ -125,8 +145,10 @@ def seed(conn: sqlite3.Connection) -> None:
         ("withdrawal_risk", "Withdrawal risk domain."),
         ("seizure_risk", "Seizure risk domain."),
     ]
-    for pe in pd_effect_descriptions:
-        upsert(conn, "INSERT OR REPLACE INTO pd_effect(id,description) VALUES(?,?)", pe)
+    conn.executemany(
+        "INSERT OR REPLACE INTO pd_effect(id,description) VALUES(?,?)",
+        pd_effect_descriptions,
+    )
 
     # Drug curation (source of truth)
     from core.constants import normalize_pd_effect_id, normalize_transporter_id
@@ -233,12 +255,16 @@ def seed(conn: sqlite3.Connection) -> None:
 
 
 def main() -> None:
-    if DB_PATH.exists():
-        DB_PATH.unlink()
-    conn = connect(DB_PATH)
+    # Seed into memory first: the load is IO-bound when done against the file
+    # directly, while an in-memory build plus a single VACUUM INTO snapshot
+    # writes one compact, defragmented file sequentially.
+    conn = connect(":memory:")
     apply_schema(conn)
     seed(conn)
     conn.commit()
+    if DB_PATH.exists():
+        DB_PATH.unlink()
+    conn.execute(f"VACUUM INTO '{DB_PATH}'")
     conn.close()
     print(f"Seeded {DB_PATH}")
 
@@ -2,8 +2,33 @@
 
 from __future__ import annotations
 
+import re
+from functools import cache
+
 from core.models import Facts, RuleHit
 
+# Matches any {placeholder} token; keep in sync with rules.validate_rules.
+_PLACEHOLDER_RE = re.compile(r"\{([a-zA-Z0-9_]+)\}")
+
+
+@cache
+def _compile_template(template: str) -> tuple[str | tuple[str, str], ...]:
+    """Split a template into literal segments and (name, raw) placeholder markers.
+
+    Templates come from a small fixed set of rule files, so compiling once and
+    caching avoids re-scanning the full template string on every render.
+    """
+    segments: list[str | tuple[str, str]] = []
+    pos = 0
+    for m in _PLACEHOLDER_RE.finditer(template):
+        if m.start() > pos:
+            segments.append(template[pos : m.start()])
+        segments.append((m.group(1), m.group(0)))
+        pos = m.end()
+    if pos < len(template):
+        segments.append(template[pos:])
+    return tuple(segments)
+
 
 def _drug_name(facts: Facts, drug_id: str) -> str:
     d = facts.drugs.get(drug_id)
@@ -11,9 +36,10 @@ def _drug_name(facts: Facts, drug_id: str) -> str:
 
 
 def _format_text(text: str, mapping: dict[str, str]) -> str:
-    for k, v in mapping.items():
-        text = text.replace("{" + k + "}", v)
-    return text
+    # Single C-level scan; unknown placeholders are left as-is.
+    return _PLACEHOLDER_RE.sub(
+        lambda m: mapping.get(m.group(1), m.group(0)), text
+    )
 
 
 def render_explanation(template: str, facts: Facts, hit: RuleHit) -> str:
@@ -27,10 +53,10 @@ def render_explanation(template: str, facts: Facts, hit: RuleHit) -> str:
             continue
         mapping[k] = str(v)
 
-    text = template
-    for key, val in mapping.items():
-        text = text.replace("{" + key + "}", val)
-    return text
+    return "".join(
+        seg if isinstance(seg, str) else mapping.get(seg[0], seg[1])
+        for seg in _compile_template(template)
+    )
 
 
 def render_rationale(facts: Facts, hit: RuleHit) -> str:
@@ -47,4 +73,3 @@ def render_rationale(facts: Facts, hit: RuleHit) -> str:
     for line in hit.rationale:
         bullets.append("- " + _format_text(line, mapping))
     return "\n".join(bullets)
-
@@ -1,41 +1,47 @@
 from __future__ import annotations
 
+import operator
 from collections import defaultdict
 
 from core.constants import PD_EFFECT_CNS_DEP, TRANSPORTER_PGP
 from core.enums import Domain, RuleClass, Severity
 from core.models import Facts, RuleHit
 
-_SEV_RANK = {
-    Severity.info: 0,
-    Severity.caution: 1,
-    Severity.major: 2,
-    Severity.contraindicated: 3,
-}
+# Magnitudes that qualify a drug's CNS-depressant effect for amplification.
+_CNS_MAG = frozenset({"medium", "high"})
 
-_CLASS_RANK = {
-    RuleClass.info: 0,
-    RuleClass.caution: 1,
-    RuleClass.adjust_monitor: 2,
-    RuleClass.avoid: 3,
-}
+# Shared read-only fallback so `h.inputs or _EMPTY` never allocates.
+_EMPTY: dict[str, str] = {}
+
+# Severity/RuleClass carry a shared integer rank (see core.enums); attrgetter
+# keeps the max() key C-implemented.
+_rank_key = operator.attrgetter("rank")
 
 
 def _max_sev(hits: list[RuleHit]) -> Severity:
-    return max((h.severity for h in hits), key=lambda s: _SEV_RANK[s])
+    return max((h.severity for h in hits), key=_rank_key, default=Severity.info)
 
 
 def _max_class(hits: list[RuleHit]) -> RuleClass:
-    return max((h.rule_class for h in hits), key=lambda c: _CLASS_RANK[c])
+    return max((h.rule_class for h in hits), key=_rank_key, default=RuleClass.info)
 
 
-def _pair_key(h: RuleHit) -> tuple[str, str] | None:
-    inputs = h.inputs or {}
-    a = inputs.get("A")
-    b = inputs.get("B")
-    if not a or not b:
-        return None
-    return (a, b)
+def _reduce_pair(pair_hits: list[RuleHit]) -> tuple[Severity, RuleClass, set[str]]:
+    """
+    Single fused walk over a pair's hits: running max severity, running max
+    rule class, and the accumulated mechanism set. Replaces three separate
+    traversals of the same list.
+    """
+    max_sev = Severity.info
+    max_cls = RuleClass.info
+    mechs: set[str] = set()
+    for h in pair_hits:
+        if h.severity.rank > max_sev.rank:
+            max_sev = h.severity
+        if h.rule_class.rank > max_cls.rank:
+            max_cls = h.rule_class
+        _add_pk_mechanisms(mechs, h)
+    return max_sev, max_cls, mechs
 
 
 def _escalate_severity_for_multi_mech(
@@ -59,48 +65,45 @@ def _escalate_severity_for_multi_mech(
     return base
 
 
-def _pk_mechanisms_for_hit(h: RuleHit) -> set[str]:
+def _add_pk_mechanisms(mechs: set[str], h: RuleHit) -> None:
     """
-    Extract mechanism labels from a PK RuleHit.
+    Accumulate mechanism labels from a PK RuleHit into `mechs`.
     Conservative: only uses existing fields (inputs enzyme_id/transporter_id).
+    Updating the caller's set in place avoids a throwaway set per hit.
     """
     if h.domain != Domain.PK:
-        return set()
+        return
 
-    inputs = h.inputs or {}
-    out: set[str] = set()
+    inputs = h.inputs or _EMPTY
 
     enzyme_id = inputs.get("enzyme_id")
     if isinstance(enzyme_id, str):
         eid = enzyme_id.upper()
         if eid.startswith("CYP"):
-            out.add("cyp")
+            mechs.add("cyp")
         elif eid.startswith("UGT"):
-            out.add("ugt")
+            mechs.add("ugt")
 
     transporter_id = inputs.get("transporter_id")
     if transporter_id == TRANSPORTER_PGP:
-        out.add("pgp")
+        mechs.add("pgp")
     elif isinstance(transporter_id, str) and transporter_id:
-        out.add(transporter_id.lower())
+        mechs.add(transporter_id.lower())
+
 
-    return out
+# Preserve existing IDs for common dual-mechanism cases.
+_MECHS_TO_RID: dict[frozenset[str], str] = {
+    frozenset({"cyp", "pgp"}): "PK_DUAL_MECH_INCREASE",
+    frozenset({"cyp", "ugt"}): "PK_DUAL_MECH_INCREASE_CYP_UGT",
+    frozenset({"ugt", "pgp"}): "PK_DUAL_MECH_INCREASE_UGT_PGP",
+}
 
 
 def _rule_id_for_mechs(mechs: set[str]) -> str:
-    """
-    Preserve existing IDs for common dual-mechanism cases.
-    """
-    if mechs == {"cyp", "pgp"}:
-        return "PK_DUAL_MECH_INCREASE"
-    if mechs == {"cyp", "ugt"}:
-        return "PK_DUAL_MECH_INCREASE_CYP_UGT"
-    if mechs == {"ugt", "pgp"}:
-        return "PK_DUAL_MECH_INCREASE_UGT_PGP"
-    return "PK_MULTI_MECH_INCREASE"
+    return _MECHS_TO_RID.get(frozenset(mechs), "PK_MULTI_MECH_INCREASE")
 
 
-def _label_for_mechs(mechs: set[str]) -> str:
+def _build_label(mechs: frozenset[str]) -> str:
     order = ["cyp", "ugt", "pgp"]
     pretty = {"cyp": "CYP", "ugt": "UGT", "pgp": "P-gp"}
 
@@ -112,35 +115,88 @@ def _label_for_mechs(mechs: set[str]) -> str:
     return " + ".join(parts) if parts else "multiple PK"
 
 
-def apply_pk_multi_mechanism_exposure_increase(
-    facts: Facts,
+# Mechanism sets recur across pairs, so labels are memoized by frozenset.
+_MECHS_TO_LABEL: dict[frozenset[str], str] = {}
+
+# Static payloads shared across every emitted composite hit. Treat as
+# read-only: each RuleHit points at the same objects instead of fresh copies.
+_MULTI_MECH_ACTIONS = [
+    "Use extra caution when multiple exposure-increasing mechanisms apply.",
+    "Consider alternatives, dose adjustment, and closer monitoring when clinically appropriate.",
+]
+_MULTI_MECH_REFERENCES = [
+    {
+        "source": "Educational note",
+        "citation": "Multiple PK mechanisms can be additive or synergistic.",
+    }
+]
+_CNS_AMP_ACTIONS = [
+    "Use caution with sedation and impairment risk.",
+    "Consider reducing overlapping sedatives and monitoring for oversedation (educational).",
+]
+_CNS_AMP_RATIONALE = [
+    "{A_name} has CNS-depressant effects.",
+    "Rules indicate increased exposure of {A_name}, which may amplify sedation-related adverse effects.",
+]
+_CNS_AMP_REFERENCES = [
+    {
+        "source": "Educational note",
+        "citation": "Composite: PK exposure increase can amplify PD effects.",
+    }
+]
+_CNS_AMP_TAGS = ["composite", "cns_depression_amplified"]
+
+
+def _label_for_mechs(mechs: set[str]) -> str:
+    key = frozenset(mechs)
+    label = _MECHS_TO_LABEL.get(key)
+    if label is None:
+        label = _MECHS_TO_LABEL[key] = _build_label(key)
+    return label
+
+
+def _scan_pk_hits(
     hits: list[RuleHit],
-    *,
-    min_mechanisms: int = 2,
-    escalate_severity: bool = False,
-) -> list[RuleHit]:
+) -> tuple[dict[tuple[str, str], list[RuleHit]], set[tuple[str, str | None, str | None]]]:
     """
-    General composite: if >= min_mechanisms distinct PK exposure-increase mechanisms
-    are present for the same (A,B), emit a composite hit.
+    Single streaming pass over the hit list building both the
+    exposure-increase (A, B) grouping and the PK duplicate-check key set.
 
-    Severity escalation is optional and conservative (off by default).
+    Pair-key extraction is inlined here: this is the hot path and a helper
+    would re-read h.inputs through an extra call frame per hit.
     """
     by_pair: dict[tuple[str, str], list[RuleHit]] = defaultdict(list)
+    existing: set[tuple[str, str | None, str | None]] = set()
     for h in hits:
         if h.domain != Domain.PK:
             continue
-        if "exposure_increase" not in (h.tags or []):
+        inputs = h.inputs or _EMPTY
+        a = inputs.get("A")
+        b = inputs.get("B")
+        existing.add((h.rule_id, a, b))
+        if "exposure_increase" not in (h.tags or ()):
             continue
-        key = _pair_key(h)
-        if key:
-            by_pair[key].append(h)
+        if a and b:
+            by_pair[(a, b)].append(h)
+    return by_pair, existing
 
-    out = hits[:]
+
+def _multi_mech_composites(
+    by_pair: dict[tuple[str, str], list[RuleHit]],
+    existing: set[tuple[str, str | None, str | None]],
+    *,
+    min_mechanisms: int,
+    escalate_severity: bool,
+) -> list[RuleHit]:
+    """
+    Build the multi-mechanism composite hits from the precomputed grouping
+    and duplicate-check key set (see _scan_pk_hits).
+    Returns only the newly emitted composites; callers concatenate.
+    """
+    new_hits: list[RuleHit] = []
 
     for (a, b), pair_hits in by_pair.items():
-        mechs: set[str] = set()
-        for h in pair_hits:
-            mechs.update(_pk_mechanisms_for_hit(h))
+        base_sev, cls, mechs = _reduce_pair(pair_hits)
 
         if len(mechs) < min_mechanisms:
             continue
@@ -148,23 +204,15 @@ def apply_pk_multi_mechanism_exposure_increase(
         rid = _rule_id_for_mechs(mechs)
         label = _label_for_mechs(mechs)
 
-        already = any(
-            h.domain == Domain.PK
-            and h.rule_id == rid
-            and (h.inputs or {}).get("A") == a
-            and (h.inputs or {}).get("B") == b
-            for h in out
-        )
-        if already:
+        if (rid, a, b) in existing:
             continue
+        existing.add((rid, a, b))
 
-        base_sev = _max_sev(pair_hits)
         sev = _escalate_severity_for_multi_mech(
             base_sev,
             mech_count=len(mechs),
             enabled=escalate_severity,
         )
-        cls = _max_class(pair_hits)
 
         rationale: list[str] = [
             f"More than one exposure-increasing PK mechanism is present ({label}).",
@@ -180,7 +228,7 @@ def apply_pk_multi_mechanism_exposure_increase(
         if is_dual:
             tags.append("dual_mechanism")
 
-        out.append(
+        new_hits.append(
             RuleHit(
                 rule_id=rid,
                 name=f"Multiple PK mechanisms may increase exposure ({label})",
@@ -190,20 +238,35 @@ def apply_pk_multi_mechanism_exposure_increase(
                 inputs={"A": a, "B": b},
                 tags=tags,
                 rationale=rationale,
-                actions=[
-                    "Use extra caution when multiple exposure-increasing mechanisms apply.",
-                    "Consider alternatives, dose adjustment, and closer monitoring when clinically appropriate.",
-                ],
-                references=[
-                    {
-                        "source": "Educational note",
-                        "citation": "Multiple PK mechanisms can be additive or synergistic.",
-                    }
-                ],
+                actions=_MULTI_MECH_ACTIONS,
+                references=_MULTI_MECH_REFERENCES,
             )
         )
 
-    return out
+    return new_hits
+
+
+def apply_pk_multi_mechanism_exposure_increase(
+    facts: Facts,
+    hits: list[RuleHit],
+    *,
+    min_mechanisms: int = 2,
+    escalate_severity: bool = False,
+) -> list[RuleHit]:
+    """
+    General composite: if >= min_mechanisms distinct PK exposure-increase mechanisms
+    are present for the same (A,B), emit a composite hit.
+
+    Severity escalation is optional and conservative (off by default).
+    """
+    by_pair, existing = _scan_pk_hits(hits)
+
+    return hits + _multi_mech_composites(
+        by_pair,
+        existing,
+        min_mechanisms=min_mechanisms,
+        escalate_severity=escalate_severity,
+    )
 
 
 # Compatibility wrappers for existing tests / older call sites.
@@ -241,66 +304,50 @@ def apply_composites(
     *,
     include_pk_pd_composites: bool = True,
 ) -> list[RuleHit]:
-    out = hits[:]
+    # Pass 1: one streaming scan of the hit list builds the exposure-increase
+    # grouping and the duplicate-check key set for every composite below.
+    # Pass 2 emits into new_hits so `hits` is never copied up front.
+    by_pair, existing = _scan_pk_hits(hits)
+    new_hits: list[RuleHit] = []
 
     if include_pk_pd_composites:
         # PK -> PD composite (CNS depression amplification)
-        pk_up_pairs: list[tuple[str, str]] = []
-        for h in out:
-            if h.domain != Domain.PK:
-                continue
-            if "exposure_increase" not in (h.tags or []):
-                continue
-            key = _pair_key(h)
-            if key:
-                pk_up_pairs.append(key)
-
-        seen: set[tuple[str, str]] = set()
-        for affected_a, interacting_b in pk_up_pairs:
-            key = (affected_a, interacting_b)
-            if key in seen:
-                continue
-            seen.add(key)
-
-            has_cns = any(
-                e.effect_id == PD_EFFECT_CNS_DEP and e.magnitude in ("medium", "high")
-                for e in facts.pd_effects.get(affected_a, [])
-            )
+        # A drug with many interacting partners shares one CNS scan via the cache.
+        pd_effects = facts.pd_effects
+        cns_cache: dict[str, bool] = {}
+        for affected_a, interacting_b in by_pair:
+            has_cns = cns_cache.get(affected_a)
+            if has_cns is None:
+                has_cns = cns_cache[affected_a] = any(
+                    e.effect_id == PD_EFFECT_CNS_DEP and e.magnitude in _CNS_MAG
+                    for e in pd_effects.get(affected_a, ())
+                )
             if not has_cns:
                 continue
 
-            out.append(
+            new_hits.append(
                 RuleHit(
                     rule_id="COMP_PK_UP_CNS_DEP",
                     name="Increased exposure may amplify CNS depression effects",
                     domain=Domain.PD,
                     severity=Severity.major,
                     rule_class=RuleClass.adjust_monitor,
-                    actions=[
-                        "Use caution with sedation and impairment risk.",
-                        "Consider reducing overlapping sedatives and monitoring for oversedation (educational).",
-                    ],
+                    actions=_CNS_AMP_ACTIONS,
                     inputs={"A": affected_a, "B": interacting_b},
-                    rationale=[
-                        "{A_name} has CNS-depressant effects.",
-                        "Rules indicate increased exposure of {A_name}, which may amplify sedation-related adverse effects.",
-                    ],
-                    references=[
-                        {
-                            "source": "Educational note",
-                            "citation": "Composite: PK exposure increase can amplify PD effects.",
-                        }
-                    ],
-                    tags=["composite", "cns_depression_amplified"],
+                    rationale=_CNS_AMP_RATIONALE,
+                    references=_CNS_AMP_REFERENCES,
+                    tags=_CNS_AMP_TAGS,
                 )
             )
 
     # Escalation OFF by default for stable output.
-    out = apply_pk_multi_mechanism_exposure_increase(
-        facts,
-        out,
-        min_mechanisms=2,
-        escalate_severity=False,
+    new_hits.extend(
+        _multi_mech_composites(
+            by_pair,
+            existing,
+            min_mechanisms=2,
+            escalate_severity=False,
+        )
     )
 
-    return out
+    return hits + new_hits
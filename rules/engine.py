@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Sequence
 from dataclasses import dataclass, field
+from itertools import combinations
 from pathlib import Path
 from typing import Any
 
@@ -11,7 +13,7 @@ from core.models import Facts, RuleHit
 from data.loaders import load_transporters
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Rule:
     id: str
     name: str
@@ -24,17 +26,73 @@ class Rule:
     # Defaults last
     actions: list[str] = field(default_factory=list)
     tags: list[str] = field(default_factory=list)
+    # Precompiled view of `logic`, attached by load_rules so evaluation never
+    # re-parses the dict; None for hand-built Rules (evaluate_rule plans lazily).
+    plan: _RulePlan | None = field(default=None, compare=False, repr=False)
+    # Mechanism tags precomputed by load_rules; None means derive on demand.
+    mechanisms: tuple[str, ...] | None = field(default=None, compare=False, repr=False)
 
 
 TRANSPORTERS = load_transporters()
 
+_MAG_RANK = {"low": 1, "medium": 2, "high": 3}
+
+
+@dataclass(frozen=True)
+class _FactsIndex:
+    """
+    Hashed views of Facts so evaluate_rule predicates are O(1) probes
+    instead of linear scans over per-drug role lists.
+
+    enzyme/transporter map (drug_id, enzyme/transporter_id, role) to the set
+    of strengths asserted for that role; pd maps (drug_id, effect_id) to the
+    highest magnitude rank asserted for that effect.
+    """
+
+    enzyme: dict[tuple[str, str, str], set[str | None]]
+    transporter: dict[tuple[str, str, str], set[str | None]]
+    pd: dict[tuple[str, str], int]
+
+
+def _build_facts_index(facts: Facts) -> _FactsIndex:
+    enzyme: dict[tuple[str, str, str], set[str | None]] = {}
+    for drug_id, roles in facts.enzyme_roles.items():
+        for r in roles:
+            enzyme.setdefault((drug_id, r.enzyme_id, r.role), set()).add(r.strength)
+
+    transporter: dict[tuple[str, str, str], set[str | None]] = {}
+    for drug_id, t_roles in facts.transporter_roles.items():
+        for t in t_roles:
+            transporter.setdefault((drug_id, t.transporter_id, t.role), set()).add(
+                t.strength
+            )
+
+    pd: dict[tuple[str, str], int] = {}
+    for drug_id, effects in facts.pd_effects.items():
+        for e in effects:
+            key = (drug_id, e.effect_id)
+            rank = _MAG_RANK.get(e.magnitude, 0)
+            if rank > pd.get(key, -1):
+                pd[key] = rank
+
+    return _FactsIndex(enzyme=enzyme, transporter=transporter, pd=pd)
+
 
 def rule_mechanisms(rule: Rule) -> list[str]:
     """
     Infer mechanism tags from a rule's logic block.
     Used for CLI filtering (CYP vs transporters vs PD) without hardcoding rule IDs.
+
+    Rules built by load_rules carry the tags precomputed; hand-built Rules
+    derive them on demand.
     """
-    L = rule.logic or {}
+    if rule.mechanisms is not None:
+        return list(rule.mechanisms)
+    return _mechanisms_for_logic(rule.logic, rule.domain)
+
+
+def _mechanisms_for_logic(L: dict[str, Any] | None, domain: Domain) -> list[str]:
+    L = L or {}
     out: list[str] = []
 
     # Enzyme mechanism tagging
@@ -75,23 +133,39 @@ def rule_mechanisms(rule: Rule) -> list[str]:
     if "pd_overlap" in L:
         out.append("pd")
 
-    if not out and rule.domain == Domain.PK and "drug_pair" in L:
+    if not out and domain == Domain.PK and "drug_pair" in L:
         out.append("named_pair")
 
     return out
 
 
+# load_rules memo: rule_dir -> (file-stat signature, parsed rules). The
+# signature covers names and mtimes, so edits/additions/removals invalidate.
+_RULES_CACHE: dict[Path, tuple[tuple[tuple[str, int], ...], list[Rule]]] = {}
+
+
 def load_rules(rule_dir: Path) -> list[Rule]:
+    files = sorted(rule_dir.glob("*.json"))
+    signature = tuple((p.name, p.stat().st_mtime_ns) for p in files)
+    cached = _RULES_CACHE.get(rule_dir)
+    if cached is not None and cached[0] == signature:
+        # Shallow copy: Rule instances are frozen and shared, but callers may
+        # filter/extend the list without poisoning the cache.
+        return list(cached[1])
+
     rules: list[Rule] = []
 
-    for p in sorted(rule_dir.glob("*.json")):
-        raw = json.loads(p.read_text(encoding="utf-8"))
+    for p in files:
+        # json.loads accepts bytes directly; skipping the text decode pass
+        # saves a full copy of each rule file.
+        raw = json.loads(p.read_bytes())
 
         try:
+            domain = Domain(raw["domain"])
             rule = Rule(
                 id=raw["id"],
                 name=raw["name"],
-                domain=Domain(raw["domain"]),
+                domain=domain,
                 severity=Severity(raw["severity"]),
                 rule_class=RuleClass(raw.get("rule_class", "caution")),
                 logic=raw["logic"],
@@ -102,6 +176,8 @@ def load_rules(rule_dir: Path) -> list[Rule]:
                 references=raw.get("references", []),
                 actions=raw.get("actions", []),
                 tags=raw.get("tags", []),
+                plan=_plan_logic(raw["logic"]),
+                mechanisms=tuple(_mechanisms_for_logic(raw["logic"], domain)),
             )
         except KeyError as e:
             raise ValueError(
@@ -110,78 +186,63 @@ def load_rules(rule_dir: Path) -> list[Rule]:
 
         rules.append(rule)
 
-    return rules
+    _RULES_CACHE[rule_dir] = (signature, rules)
+    return list(rules)
 
 def _matches_drug_pair(drug_pair: dict, facts: Facts) -> bool:
     needed = {drug_pair["a"], drug_pair["b"]}
     present = {d.id for d in facts.drugs}
     return needed.issubset(present)
 
-def _strength_ok(
-    actual: str | None, required: str | None, allowed: list[str] | None = None
+def _strengths_ok(
+    strengths: set[str | None] | None,
+    required: str | None,
+    allowed: frozenset[str] | list[str] | None,
 ) -> bool:
+    if strengths is None:
+        return False
     if required is None and not allowed:
         return True
-
-    if actual is None:
-        return False
-
     if allowed:
-        return actual in allowed
-
-    return actual == required
+        return not strengths.isdisjoint(allowed)
+    return required in strengths
 
 
 def _drug_has_enzyme_role(
-    facts: Facts,
+    index: _FactsIndex,
     drug_id: str,
     enzyme_id: str,
     role: str,
     strength: str | None = None,
-    strength_in: list[str] | None = None,
+    strength_in: frozenset[str] | list[str] | None = None,
 ) -> bool:
-    for r in facts.enzyme_roles.get(drug_id, []):
-        if r.enzyme_id != enzyme_id:
-            continue
-        if r.role != role:
-            continue
-        if not _strength_ok(r.strength, strength, strength_in):
-            continue
-        return True
-    return False
+    return _strengths_ok(
+        index.enzyme.get((drug_id, enzyme_id, role)), strength, strength_in
+    )
 
 
 def _drug_has_transporter_role(
-    facts: Facts,
+    index: _FactsIndex,
     drug_id: str,
     transporter_id: str,
     role: str,
     strength: str | None = None,
-    strength_in: list[str] | None = None,
+    strength_in: frozenset[str] | list[str] | None = None,
 ) -> bool:
-    for r in facts.transporter_roles.get(drug_id, []):
-        if r.transporter_id != transporter_id:
-            continue
-        if r.role != role:
-            continue
-        if not _strength_ok(r.strength, strength, strength_in):
-            continue
-        return True
-    return False
+    return _strengths_ok(
+        index.transporter.get((drug_id, transporter_id, role)), strength, strength_in
+    )
 
 
 def _drug_has_pd_effect(
-    facts: Facts, drug_id: str, effect_id: str, min_magnitude: str | None = None
+    index: _FactsIndex, drug_id: str, effect_id: str, min_magnitude: str | None = None
 ) -> bool:
-    order = {"low": 1, "medium": 2, "high": 3}
-    for e in facts.pd_effects.get(drug_id, []):
-        if e.effect_id != effect_id:
-            continue
-        if min_magnitude is None:
-            return True
-        if order.get(e.magnitude, 0) >= order.get(min_magnitude, 0):
-            return True
-    return False
+    rank = index.pd.get((drug_id, effect_id))
+    if rank is None:
+        return False
+    if min_magnitude is None:
+        return True
+    return rank >= _MAG_RANK.get(min_magnitude, 0)
 
 
 def _ti_is(facts: Facts, drug_id: str, ti: str) -> bool:
@@ -193,117 +254,218 @@ def _patient_flag(facts: Facts, flag: str) -> bool:
     return bool(facts.patient_flags.get(flag, False))
 
 
-def _transporter_ids_for_family(family: str) -> list[str]:
-    ids: list[str] = []
+def _build_family_index(transporters) -> dict[str, list[str]]:
+    """Map transporter family -> ids, handling both dict and list shapes."""
+    index: dict[str, list[str]] = {}
 
-    # Case 1: TRANSPORTERS is a dict
-    if isinstance(TRANSPORTERS, dict):
-        for t_id, t in TRANSPORTERS.items():
+    # Case 1: transporters is a dict
+    if isinstance(transporters, dict):
+        for t_id, t in transporters.items():
             # t might be a dict (new) OR a string (old)
             if isinstance(t, dict):
-                if (t.get("family") or "") == family:
-                    ids.append(t_id)
+                family = t.get("family") or ""
+                if family:
+                    index.setdefault(family, []).append(t_id)
+        return index
+
+    # Case 2: transporters is a list
+    for t in transporters:
+        if isinstance(t, dict):
+            family = t.get("family") or ""
+            t_id = t.get("id")
+            if family and t_id:
+                index.setdefault(family, []).append(t_id)
 
-        return ids
+    return index
 
-    # Case 2: TRANSPORTERS is a list
-    for t in TRANSPORTERS:
-        if isinstance(t, dict) and (t.get("family") or "") == family:
-            t_id = t.get("id")
-            if t_id:
-                ids.append(t_id)
 
-    return ids
+# Built once at import so family-based rules don't re-scan the table per call.
+FAMILY_TO_TIDS = _build_family_index(TRANSPORTERS)
 
-def _matches_name_constraints(logic: dict[str, Any], a: str, b: str) -> bool:
-    a_name = a.lower()
-    b_name = b.lower()
 
-    a_name_is = logic.get("A_name_is")
-    if a_name_is and a_name != str(a_name_is).lower():
-        return False
+def _transporter_ids_for_family(family: str) -> list[str]:
+    return FAMILY_TO_TIDS.get(family, [])
 
-    b_name_is = logic.get("B_name_is")
-    if b_name_is and b_name != str(b_name_is).lower():
-        return False
+@dataclass(frozen=True)
+class _RulePlan:
+    """
+    Preresolved view of Rule.logic so per-pair evaluation does no dict
+    parsing: enzyme/transporter/pd blocks are unpacked, transporter families
+    are expanded to concrete ids, and name constraints are pre-lowered.
+    """
 
-    a_name_not_is = logic.get("A_name_not_is", [])
-    if isinstance(a_name_not_is, str):
-        a_name_not_is = [a_name_not_is]
-    if a_name in {str(x).lower() for x in a_name_not_is}:
-        return False
+    drug_pair: tuple[str, str] | None
+    # (enzyme_id, a_role, b_role, b_strength, b_strength_in)
+    enzyme: tuple[str, str, str, str | None, frozenset[str] | None] | None
+    # (t_ids, a_role, b_role, b_strength, b_strength_in)
+    transporter: (
+        tuple[tuple[str, ...], str, str, str | None, frozenset[str] | None] | None
+    )
+    # Precomputed extra `inputs` entries for the transporter block
+    transporter_inputs: tuple[tuple[str, str], ...]
+    # (effect_id, min_magnitude_rank)
+    pd_overlap: tuple[str, int | None] | None
+    a_name_is: str | None
+    b_name_is: str | None
+    a_name_not: frozenset[str]
+    b_name_not: frozenset[str]
+    a_ti: str | None
+    requires_patient_flag: str | None
+    rationale: list[str]
+    # False when the logic block can never match (e.g. transporter without id/family)
+    matchable: bool = True
 
-    b_name_not_is = logic.get("B_name_not_is", [])
-    if isinstance(b_name_not_is, str):
-        b_name_not_is = [b_name_not_is]
-    if b_name in {str(x).lower() for x in b_name_not_is}:
-        return False
 
-    return True
+def _as_frozen(value: list[str] | None) -> frozenset[str] | None:
+    # strength_in lists come from rule JSON; a frozenset makes the repeated
+    # isdisjoint membership checks hash-based and the plan immutable.
+    return frozenset(value) if value is not None else None
 
-def evaluate_rule(rule: Rule, facts: Facts, a: str, b: str) -> RuleHit | None:
-    """
-    Evaluate a single rule for ordered pair (A=a, B=b).
-    Rules are written assuming A is the affected drug and B is the interacting drug.
-    """
-    L = rule.logic
-    inputs: dict[str, Any] = {"A": a, "B": b}
 
-    # Explicit drug-pair guard
+def _as_lowered_set(value: Any) -> frozenset[str]:
+    if value is None:
+        return frozenset()
+    if isinstance(value, str):
+        value = [value]
+    return frozenset(str(x).lower() for x in value)
+
+
+def _plan_rule(rule: Rule) -> _RulePlan:
+    return rule.plan or _plan_logic(rule.logic)
+
+
+def _plan_logic(L: dict[str, Any]) -> _RulePlan:
+    matchable = True
+
+    drug_pair = None
     if "drug_pair" in L:
         pair = L["drug_pair"]
-        if a != pair["a"] or b != pair["b"]:
-            return None
+        drug_pair = (pair["a"], pair["b"])
 
-    # Enzyme pattern
+    enzyme = None
     if "enzyme" in L:
-        enzyme_id = L["enzyme"]["id"]
-        inputs["enzyme_id"] = enzyme_id
-
-        a_role = L["enzyme"]["A_role"]
-        b_role = L["enzyme"]["B_role"]
-
-        a_ok = _drug_has_enzyme_role(facts, a, enzyme_id, a_role)
-        b_ok = _drug_has_enzyme_role(
-            facts,
-            b,
-            enzyme_id,
-            b_role,
-            strength=L["enzyme"].get("B_strength"),
-            strength_in=L["enzyme"].get("B_strength_in"),
+        enz = L["enzyme"]
+        enzyme = (
+            enz["id"],
+            enz["A_role"],
+            enz["B_role"],
+            enz.get("B_strength"),
+            _as_frozen(enz.get("B_strength_in")),
         )
-        if not (a_ok and b_ok):
-            return None
 
-    # Transporter pattern
+    transporter = None
+    transporter_inputs: tuple[tuple[str, str], ...] = ()
     if "transporter" in L:
         t_block = L["transporter"]
         t_id = t_block.get("id")
         t_family = t_block.get("family")
 
         if t_id:
-            t_ids = [t_id]
-            inputs["transporter_id"] = t_id
+            t_ids: tuple[str, ...] = (t_id,)
+            transporter_inputs = (("transporter_id", t_id),)
         elif t_family:
-            t_ids = _transporter_ids_for_family(t_family)
-            inputs["transporter_family"] = t_family
+            t_ids = tuple(_transporter_ids_for_family(t_family))
+            transporter_inputs = (("transporter_family", t_family),)
             if len(t_ids) == 1:
-                inputs["transporter_id"] = t_ids[0]
+                transporter_inputs += (("transporter_id", t_ids[0]),)
         else:
+            t_ids = ()
+            matchable = False
+
+        transporter = (
+            t_ids,
+            t_block.get("A_role"),
+            t_block.get("B_role"),
+            t_block.get("B_strength"),
+            _as_frozen(t_block.get("B_strength_in")),
+        )
+
+    pd_overlap = None
+    if "pd_overlap" in L:
+        pd = L["pd_overlap"]
+        min_mag = pd.get("min_magnitude")
+        # Resolve the magnitude threshold to its rank once; the facts index
+        # stores ranks, so evaluation compares ints directly.
+        pd_overlap = (
+            pd["effect_id"],
+            _MAG_RANK.get(min_mag, 0) if min_mag is not None else None,
+        )
+
+    a_name_is = L.get("A_name_is")
+    b_name_is = L.get("B_name_is")
+
+    return _RulePlan(
+        drug_pair=drug_pair,
+        enzyme=enzyme,
+        transporter=transporter,
+        transporter_inputs=transporter_inputs,
+        pd_overlap=pd_overlap,
+        a_name_is=str(a_name_is).lower() if a_name_is else None,
+        b_name_is=str(b_name_is).lower() if b_name_is else None,
+        a_name_not=_as_lowered_set(L.get("A_name_not_is")),
+        b_name_not=_as_lowered_set(L.get("B_name_not_is")),
+        a_ti=L.get("A_ti"),
+        requires_patient_flag=L.get("requires_patient_flag"),
+        rationale=L.get("rationale", []),
+        matchable=matchable,
+    )
+
+
+def evaluate_rule(
+    rule: Rule,
+    facts: Facts,
+    a: str,
+    b: str,
+    index: _FactsIndex | None = None,
+    plan: _RulePlan | None = None,
+) -> RuleHit | None:
+    """
+    Evaluate a single rule for ordered pair (A=a, B=b).
+    Rules are written assuming A is the affected drug and B is the interacting drug.
+
+    evaluate_all builds the facts index and rule plans once and passes them
+    in; standalone callers can omit both and pay the (cheap) per-call build.
+    """
+    if index is None:
+        index = _build_facts_index(facts)
+    if plan is None:
+        plan = _plan_rule(rule)
+
+    if not plan.matchable:
+        return None
+
+    inputs: dict[str, Any] = {"A": a, "B": b}
+
+    # Explicit drug-pair guard
+    if plan.drug_pair is not None and (a, b) != plan.drug_pair:
+        return None
+
+    # Enzyme pattern
+    if plan.enzyme is not None:
+        enzyme_id, a_role, b_role, b_strength, b_strength_in = plan.enzyme
+        inputs["enzyme_id"] = enzyme_id
+
+        if not _drug_has_enzyme_role(index, a, enzyme_id, a_role):
+            return None
+        if not _drug_has_enzyme_role(
+            index, b, enzyme_id, b_role, strength=b_strength, strength_in=b_strength_in
+        ):
             return None
 
-        a_role = t_block["A_role"]
-        b_role = t_block["B_role"]
+    # Transporter pattern
+    if plan.transporter is not None:
+        t_ids, a_role, b_role, b_strength, b_strength_in = plan.transporter
+        inputs.update(plan.transporter_inputs)
 
-        a_ok = any(_drug_has_transporter_role(facts, a, tid, a_role) for tid in t_ids)
+        a_ok = any(_drug_has_transporter_role(index, a, tid, a_role) for tid in t_ids)
         b_ok = any(
             _drug_has_transporter_role(
-                facts,
+                index,
                 b,
                 tid,
                 b_role,
-                strength=t_block.get("B_strength"),
-                strength_in=t_block.get("B_strength_in"),
+                strength=b_strength,
+                strength_in=b_strength_in,
             )
             for tid in t_ids
         )
@@ -311,35 +473,48 @@ def evaluate_rule(rule: Rule, facts: Facts, a: str, b: str) -> RuleHit | None:
             return None
 
     # PD overlap pattern
-    if "pd_overlap" in L:
-        eff = L["pd_overlap"]["effect_id"]
+    if plan.pd_overlap is not None:
+        eff, min_rank = plan.pd_overlap
         inputs["effect_id"] = eff
-        min_mag = L["pd_overlap"].get("min_magnitude")
-        if not (
-            _drug_has_pd_effect(facts, a, eff, min_mag)
-            and _drug_has_pd_effect(facts, b, eff, min_mag)
-        ):
+        rank_a = index.pd.get((a, eff))
+        if rank_a is None or (min_rank is not None and rank_a < min_rank):
+            return None
+        rank_b = index.pd.get((b, eff))
+        if rank_b is None or (min_rank is not None and rank_b < min_rank):
             return None
 
         # Prevent symmetric duplicates for PD rules
         if a > b:
             return None
 
-    # Name constraints
-    if not _matches_name_constraints(L, a, b):
-        return None
+    # Name constraints (pre-lowered at plan time)
+    if (
+        plan.a_name_is
+        or plan.b_name_is
+        or plan.a_name_not
+        or plan.b_name_not
+    ):
+        a_name = a.lower()
+        b_name = b.lower()
+        if plan.a_name_is and a_name != plan.a_name_is:
+            return None
+        if plan.b_name_is and b_name != plan.b_name_is:
+            return None
+        if a_name in plan.a_name_not:
+            return None
+        if b_name in plan.b_name_not:
+            return None
 
     # Therapeutic index guard
-    if "A_ti" in L:
-        if not _ti_is(facts, a, L["A_ti"]):
-            return None
+    if plan.a_ti is not None and not _ti_is(facts, a, plan.a_ti):
+        return None
 
     # Patient flags
-    if "requires_patient_flag" in L:
-        if not _patient_flag(facts, L["requires_patient_flag"]):
-            return None
+    if plan.requires_patient_flag is not None and not _patient_flag(
+        facts, plan.requires_patient_flag
+    ):
+        return None
 
-    rationale = L.get("rationale", [])
     return RuleHit(
         rule_id=rule.id,
         name=rule.name,
@@ -349,26 +524,116 @@ def evaluate_rule(rule: Rule, facts: Facts, a: str, b: str) -> RuleHit | None:
         actions=rule.actions,
         tags=rule.tags,
         inputs=inputs,
-        rationale=rationale,
+        rationale=plan.rationale,
         references=rule.references,
     )
 
 
-def evaluate_all(rules: list[Rule], facts: Facts, drug_ids: list[str]) -> list[RuleHit]:
+def _rule_candidates(
+    plan: _RulePlan, index: _FactsIndex
+) -> tuple[set[str] | None, set[str] | None]:
+    """
+    Conservative per-rule candidate drug sets for the A and B sides, derived
+    from the rule's primary logic block. A drug outside its side's set can
+    never satisfy the rule, so evaluate_all can skip the full evaluation;
+    None means "no cheap filter available" (e.g. drug_pair rules).
+    Strength constraints are deliberately ignored here — the mask only has
+    to be a superset of the true matches.
+    """
+    if plan.enzyme is not None:
+        enzyme_id, a_role, b_role = plan.enzyme[0], plan.enzyme[1], plan.enzyme[2]
+        a_set: set[str] = set()
+        b_set: set[str] = set()
+        for drug_id, eid, role in index.enzyme:
+            if eid == enzyme_id:
+                if role == a_role:
+                    a_set.add(drug_id)
+                if role == b_role:
+                    b_set.add(drug_id)
+        return a_set, b_set
+
+    if plan.transporter is not None:
+        t_ids, a_role, b_role = plan.transporter[0], plan.transporter[1], plan.transporter[2]
+        a_set = set()
+        b_set = set()
+        for drug_id, tid, role in index.transporter:
+            if tid in t_ids:
+                if role == a_role:
+                    a_set.add(drug_id)
+                if role == b_role:
+                    b_set.add(drug_id)
+        return a_set, b_set
+
+    if plan.pd_overlap is not None:
+        eff = plan.pd_overlap[0]
+        both = {drug_id for drug_id, effect_id in index.pd if effect_id == eff}
+        return both, both
+
+    return None, None
+
+
+def evaluate_all(
+    rules: list[Rule], facts: Facts, drug_ids: Sequence[str]
+) -> list[RuleHit]:
     hits: list[RuleHit] = []
-    ordered = list(dict.fromkeys(drug_ids))  # de-dupe preserving order
-
-    for i in range(len(ordered)):
-        for j in range(i + 1, len(ordered)):
-            x = ordered[i]
-            y = ordered[j]
-
-            # Evaluate both directions so directional PK rules can match
-            for a, b in ((x, y), (y, x)):
-                for rule in rules:
-                    hit = evaluate_rule(rule, facts, a, b)
-                    if hit:
-                        hits.append(hit)
+    # Callers normally pass pre-deduped ids (resolve_drug_ids guarantees it);
+    # fall back to an order-preserving de-dupe only when they do not.
+    ordered = list(drug_ids)
+    if len(set(ordered)) != len(ordered):
+        ordered = list(dict.fromkeys(ordered))
+
+    index = _build_facts_index(facts)
+    # Plans plus candidate masks: the mask test replaces a full evaluate_rule
+    # call for the (common) pairs a rule cannot possibly match. drug_pair
+    # rules are bucketed separately by their exact (A, B) key so the inner
+    # loop probes a dict once per direction instead of iterating them all.
+    directional: list[tuple[Rule, _RulePlan, set[str] | None, set[str] | None]] = []
+    symmetric: list[tuple[Rule, _RulePlan, set[str] | None, set[str] | None]] = []
+    pair_rules: dict[tuple[str, str], list[tuple[Rule, _RulePlan]]] = {}
+    for rule in rules:
+        plan = _plan_rule(rule)
+        if not plan.matchable:
+            continue
+        if plan.drug_pair is not None:
+            pair_rules.setdefault(plan.drug_pair, []).append((rule, plan))
+            continue
+        a_mask, b_mask = _rule_candidates(plan, index)
+        # A rule whose candidate set is empty on either side can never fire
+        # against these facts; drop it before the pair loop entirely.
+        if a_mask is not None and (not a_mask or not b_mask):
+            continue
+        # pd_overlap rules reject a > b inside evaluate_rule, so the reverse
+        # direction can never match; evaluate them on the canonical ordering
+        # only instead of paying the rejected call.
+        bucket = symmetric if plan.pd_overlap is not None else directional
+        bucket.append((rule, plan, a_mask, b_mask))
+
+    no_pair_rules: list[tuple[Rule, _RulePlan]] = []
+    for x, y in combinations(ordered, 2):
+        a, b = (x, y) if x < y else (y, x)
+        for rule, plan, a_mask, b_mask in symmetric:
+            if a_mask is not None and a not in a_mask:
+                continue
+            if b_mask is not None and b not in b_mask:
+                continue
+            hit = evaluate_rule(rule, facts, a, b, index, plan)
+            if hit:
+                hits.append(hit)
+
+        # Evaluate both directions so directional PK rules can match
+        for a, b in ((x, y), (y, x)):
+            for rule, plan in pair_rules.get((a, b), no_pair_rules):
+                hit = evaluate_rule(rule, facts, a, b, index, plan)
+                if hit:
+                    hits.append(hit)
+            for rule, plan, a_mask, b_mask in directional:
+                if a_mask is not None and a not in a_mask:
+                    continue
+                if b_mask is not None and b not in b_mask:
+                    continue
+                hit = evaluate_rule(rule, facts, a, b, index, plan)
+                if hit:
+                    hits.append(hit)
 
     # Suppress generic QT additive when a higher-risk QT rule exists for the same pair
     high_qt_pairs = {
@@ -40,8 +40,13 @@ ALLOWED_PLACEHOLDERS = {
 
 PLACEHOLDER_RE = re.compile(r"\{([a-zA-Z0-9_]+)\}")
 
+# Characters a placeholder name may contain (mirrors PLACEHOLDER_RE).
+_PLACEHOLDER_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_"
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class RuleError:
     file: str
     message: str
@@ -96,7 +101,31 @@ def _load_transporter_families(base_dir: Path) -> set[str]:
 
 
 def _find_placeholders(text: str) -> set[str]:
-    return {m.group(1) for m in PLACEHOLDER_RE.finditer(text or "")}
+    """
+    Collect `{name}` placeholder names from `text`.
+
+    Equivalent to scanning with PLACEHOLDER_RE but built on C-level str.find,
+    which is cheaper across the many template/rationale strings validated in
+    bulk; most strings exit on the `"{" not in text` fast path.
+    """
+    found: set[str] = set()
+    if not text or "{" not in text:
+        return found
+
+    i = text.find("{")
+    while i != -1:
+        j = text.find("}", i + 1)
+        if j == -1:
+            break
+        name = text[i + 1 : j]
+        if name and all(c in _PLACEHOLDER_CHARS for c in name):
+            found.add(name)
+            i = text.find("{", j + 1)
+        else:
+            # Not a well-formed placeholder; retry from the next brace so
+            # nested cases like "{{A_name}}" still yield the inner name.
+            i = text.find("{", i + 1)
+    return found
 
 
 def _check_string(
@@ -3,6 +3,8 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure the repository root is on sys.path so tests can import `app`, `rules`, etc.
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -28,7 +30,52 @@ def pytest_sessionstart(session):
         DB_PATH.unlink()
 
     conn = connect(DB_PATH)
+    # Throwaway test DB: durability pragmas only add fsyncs to a file we
+    # delete and rebuild every session, so trade them away for faster seeding.
+    conn.executescript(
+        "PRAGMA synchronous = OFF;"
+        "PRAGMA journal_mode = MEMORY;"
+        "PRAGMA temp_store = MEMORY;"
+    )
     apply_schema(conn)
     seed(conn)
     conn.commit()
-    conn.close()
\ No newline at end of file
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def db_conn():
+    """Shared read-only connection to an in-memory clone of the seeded DB.
+
+    Opening a fresh file connection per test repeats sqlite setup and
+    page-cache warmup that dominates the small CLI tests; cloning the seeded
+    file once via backup() keeps every query in RAM, and one session
+    connection is safe because tests only read.
+    """
+    import sqlite3
+
+    from data.seed_sqlite import DB_PATH
+
+    src = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(":memory:")
+    src.backup(conn)
+    src.close()
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON;")
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def rules():
+    """Full rule set, parsed once per session."""
+    from app.cli import RULE_DIR
+    from rules.engine import load_rules
+
+    return load_rules(RULE_DIR)
+
+
+@pytest.fixture(scope="session")
+def rule_templates(rules):
+    """Explanation templates keyed by rule id, built once per session."""
+    return {r.id: r.explanation_template for r in rules}
\ No newline at end of file
@@ -2,7 +2,41 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 
-from core.models import RuleHit
+from core.models import Facts, RuleHit
+
+# Facts cache keyed by (connection, resolved ids, flags). Tests treat Facts
+# as read-only, so sharing one instance across repeated drug lists is safe
+# and skips redundant SQL per test. Keying on the connection object itself
+# (not id()) keeps entries distinct even if a connection is recycled.
+_FACTS_CACHE: dict[tuple, Facts] = {}
+
+
+def cached_facts(conn, drug_ids: list[str], patient_flags: dict | None = None) -> Facts:
+    """Load Facts via app.cli.load_facts, memoized per connection and inputs."""
+    flags = patient_flags or {}
+    key = (conn, tuple(drug_ids), frozenset(flags.items()))
+    facts = _FACTS_CACHE.get(key)
+    if facts is None:
+        from app.cli import load_facts
+
+        facts = _FACTS_CACHE[key] = load_facts(conn, drug_ids, patient_flags=flags)
+    return facts
+
+
+# Resolved-name cache: the same input drug lists recur across many tests,
+# and resolution re-reads the alias lookup from the DB each call.
+_RESOLVE_CACHE: dict[tuple, list[str]] = {}
+
+
+def resolved_ids(conn, names: list[str]) -> list[str]:
+    """Resolve drug names via app.cli.resolve_drug_ids, memoized per connection."""
+    key = (conn, tuple(names))
+    ids = _RESOLVE_CACHE.get(key)
+    if ids is None:
+        from app.cli import resolve_drug_ids
+
+        ids = _RESOLVE_CACHE[key] = resolve_drug_ids(conn, names)
+    return list(ids)
 
 
 def rule_ids(hits: Iterable[RuleHit]) -> set[str]:
@@ -10,19 +44,36 @@ def rule_ids(hits: Iterable[RuleHit]) -> set[str]:
     return {h.rule_id for h in hits}
 
 
+def hits_by_id(hits: Iterable[RuleHit]) -> dict[str, list[RuleHit]]:
+    """Index hits by rule_id so per-rule assertions are one dict probe."""
+    by_id: dict[str, list[RuleHit]] = {}
+    for h in hits:
+        by_id.setdefault(h.rule_id, []).append(h)
+    return by_id
+
+
 def assert_no_hits(hits: Iterable[RuleHit]) -> None:
     """Assert that no rules fired."""
     assert list(hits) == [], f"Expected no rule hits, but got: {rule_ids(hits)}"
 
 
+def has_rule(hits: Iterable[RuleHit], rule_id: str) -> bool:
+    """True if any hit carries rule_id; short-circuits on the first match."""
+    return any(h.rule_id == rule_id for h in hits)
+
+
 def assert_has_rule(hits: Iterable[RuleHit], rule_id: str) -> None:
     """Assert that a specific rule fired."""
-    rids = rule_ids(hits)
-    assert rule_id in rids, f"Expected rule '{rule_id}' to fire, got: {rids}"
+    hits = list(hits)
+    assert has_rule(
+        hits, rule_id
+    ), f"Expected rule '{rule_id}' to fire, got: {rule_ids(hits)}"
 
 
 def assert_no_rule(hits: Iterable[RuleHit], rule_id: str) -> None:
     """Assert that a specific rule did NOT fire."""
-    rids = rule_ids(hits)
-    assert rule_id not in rids, f"Did NOT expect rule '{rule_id}', but got: {rids}"
+    hits = list(hits)
+    assert not has_rule(
+        hits, rule_id
+    ), f"Did NOT expect rule '{rule_id}', but got: {rule_ids(hits)}"
 
@@ -4,32 +4,28 @@ import sys
 
 import pytest
 
-from app.cli import DB_PATH, connect, main, resolve_drug_ids
+from app.cli import main, resolve_drug_ids
 from core.exceptions import UnknownDrugError
 
+pytestmark = pytest.mark.integration
 
-def test_resolve_drug_ids_raises_unknown_drug_error_for_missing_drug():
-    conn = connect(DB_PATH)
 
+def test_resolve_drug_ids_raises_unknown_drug_error_for_missing_drug(db_conn):
     with pytest.raises(UnknownDrugError) as exc:
-        resolve_drug_ids(conn, ["definitely-not-a-drug"])
+        resolve_drug_ids(db_conn, ["definitely-not-a-drug"])
 
     assert "definitely-not-a-drug" in exc.value.unknown
 
 
-def test_resolve_drug_ids_reports_multiple_unknowns():
-    conn = connect(DB_PATH)
-
+def test_resolve_drug_ids_reports_multiple_unknowns(db_conn):
     with pytest.raises(UnknownDrugError) as exc:
-        resolve_drug_ids(conn, ["nope1", "nope2"])
+        resolve_drug_ids(db_conn, ["nope1", "nope2"])
 
     assert exc.value.unknown == ("nope1", "nope2")
 
-def test_resolve_drug_ids_normalizes_common_alias_separators():
-    conn = connect(DB_PATH)
-
+def test_resolve_drug_ids_normalizes_common_alias_separators(db_conn):
     resolved = resolve_drug_ids(
-        conn, ["wellbutrin-xl", "amphetamine dextroamphetamine"]
+        db_conn, ["wellbutrin-xl", "amphetamine dextroamphetamine"]
     )
 
     assert resolved == [
@@ -38,40 +34,32 @@ def test_resolve_drug_ids_normalizes_common_alias_separators():
     ]
 
 
-def test_resolve_drug_ids_preserves_input_order_after_alias_resolution():
-    conn = connect(DB_PATH)
-
-    assert resolve_drug_ids(conn, ["diflucan", "biaxin", "seroquel"]) == [
+def test_resolve_drug_ids_preserves_input_order_after_alias_resolution(db_conn):
+    assert resolve_drug_ids(db_conn, ["diflucan", "biaxin", "seroquel"]) == [
         "fluconazole",
         "clarithromycin",
         "quetiapine",
     ]
     
-def test_resolve_drug_ids_deduplicates_after_alias_resolution():
-    conn = connect(DB_PATH)
-
+def test_resolve_drug_ids_deduplicates_after_alias_resolution(db_conn):
     assert resolve_drug_ids(
-        conn,
+        db_conn,
         ["wellbutrin-xl", "bupropion", "diflucan", "fluconazole"],
     ) == [
         "bupropion",
         "fluconazole",
     ]
 
-def test_resolve_drug_ids_includes_practical_recovery_medication_aliases():
-    conn = connect(DB_PATH)
-
-    assert resolve_drug_ids(conn, ["sublocade", "kloxxado", "depade"]) == [
+def test_resolve_drug_ids_includes_practical_recovery_medication_aliases(db_conn):
+    assert resolve_drug_ids(db_conn, ["sublocade", "kloxxado", "depade"]) == [
         "buprenorphine",
         "naloxone",
         "naltrexone",
     ]
 
 
-def test_resolve_drug_ids_includes_mecamylamine_brand_alias():
-    conn = connect(DB_PATH)
-
-    assert resolve_drug_ids(conn, ["inversine", "chantix"]) == [
+def test_resolve_drug_ids_includes_mecamylamine_brand_alias(db_conn):
+    assert resolve_drug_ids(db_conn, ["inversine", "chantix"]) == [
         "mecamylamine",
         "varenicline",
     ]
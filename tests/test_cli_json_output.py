@@ -3,20 +3,24 @@ from __future__ import annotations
 import json
 import sys
 
+import pytest
+
 import app.cli as cli_mod
-from app.cli import DB_PATH, RULE_DIR, connect, load_facts, resolve_drug_ids
+from app.cli import RULE_DIR
 from app.runtime.pairwise import _build_reports_for_all_pairs
 from app.json_output import build_json_payload
 from reasoning.combine import build_regimen_summary
 from rules.composite_rules import apply_composites
 from rules.engine import evaluate_all, load_rules
+from tests.helpers import cached_facts, resolved_ids
+
+pytestmark = pytest.mark.integration
 
 
-def _build_payload(drugs: list[str], domain: str = "all"):
-    conn = connect(DB_PATH)
-    drug_ids = resolve_drug_ids(conn, drugs)
+def _build_payload(conn, drugs: list[str], domain: str = "all"):
+    drug_ids = resolved_ids(conn, drugs)
     patient_flags = {}
-    facts = load_facts(conn, drug_ids, patient_flags=patient_flags)
+    facts = cached_facts(conn, drug_ids, patient_flags)
 
     rules_all = load_rules(RULE_DIR)
     selected = cli_mod._parse_domain_selection(domain)
@@ -86,8 +90,8 @@ def _assert_hit_json_contract(hit: dict):
     assert isinstance(hit["references"], list)
 
 
-def test_cli_json_payload_contract_for_two_drug_pair():
-    payload = _build_payload(["quetiapine", "clarithromycin"], domain="cyp")
+def test_cli_json_payload_contract_for_two_drug_pair(db_conn):
+    payload = _build_payload(db_conn, ["quetiapine", "clarithromycin"], domain="cyp")
 
     assert set(payload) == {
         "schema_version",
@@ -109,8 +113,9 @@ def test_cli_json_payload_contract_for_two_drug_pair():
     _assert_hit_json_contract(pair["pk"]["hits"][0])
 
 
-def test_cli_json_regimen_summary_contract_for_three_drugs():
+def test_cli_json_regimen_summary_contract_for_three_drugs(db_conn):
     payload = _build_payload(
+        db_conn,
         ["quetiapine", "hydroxyzine", "trazodone"],
         domain="all",
     )
@@ -151,8 +156,9 @@ def test_cli_json_regimen_summary_contract_for_three_drugs():
     assert isinstance(summary["top_pairs"], list)
 
 
-def test_json_payload_includes_regimen_summary_for_three_drugs():
+def test_json_payload_includes_regimen_summary_for_three_drugs(db_conn):
     payload = _build_payload(
+        db_conn,
         ["quetiapine", "hydroxyzine", "trazodone"],
         domain="all",
     )
@@ -166,8 +172,8 @@ def test_json_payload_includes_regimen_summary_for_three_drugs():
     assert "top_pairs" in summary
 
 
-def test_json_payload_is_valid_and_versioned():
-    payload = _build_payload(["citalopram", "ondansetron"], domain="pd")
+def test_json_payload_is_valid_and_versioned(db_conn):
+    payload = _build_payload(db_conn, ["citalopram", "ondansetron"], domain="pd")
     s = json.dumps(payload)
     obj = json.loads(s)
 
@@ -176,8 +182,8 @@ def test_json_payload_is_valid_and_versioned():
     assert len(obj["pairs"]) >= 1
 
 
-def test_json_payload_contains_expected_fields_for_pk_pair():
-    payload = _build_payload(["quetiapine", "clarithromycin"], domain="cyp")
+def test_json_payload_contains_expected_fields_for_pk_pair(db_conn):
+    payload = _build_payload(db_conn, ["quetiapine", "clarithromycin"], domain="cyp")
     pair = payload["pairs"][0]
 
     assert "overall" in pair
@@ -187,8 +193,8 @@ def test_json_payload_contains_expected_fields_for_pk_pair():
     assert any((h.get("explanation") or h.get("rationale")) for h in pair["pk"]["hits"])
 
 
-def test_json_hits_include_normalized_rationales():
-    payload = _build_payload(["fluoxetine", "bupropion"], domain="cyp")
+def test_json_hits_include_normalized_rationales(db_conn):
+    payload = _build_payload(db_conn, ["fluoxetine", "bupropion"], domain="cyp")
 
     hits = []
     for pair in payload["pairs"]:
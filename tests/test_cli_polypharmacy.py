@@ -1,11 +1,15 @@
 from itertools import combinations
 
+import pytest
+
 from reasoning.combine import build_pair_reports
 from tests.test_golden_scenarios import _run
 
+pytestmark = pytest.mark.integration
+
 
-def test_polypharmacy_generates_multiple_pair_reports():
-    facts, hits = _run(["digoxin", "verapamil", "clarithromycin"])
+def test_polypharmacy_generates_multiple_pair_reports(db_conn, rules):
+    facts, hits = _run(db_conn, rules, ["digoxin", "verapamil", "clarithromycin"])
     templates = {}  # fine for this test
 
     pairs = list(combinations(["digoxin", "verapamil", "clarithromycin"], 2))
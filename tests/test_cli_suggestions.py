@@ -2,16 +2,16 @@ from __future__ import annotations
 
 import pytest
 
-from app.cli import DB_PATH, connect, resolve_drug_ids
+from app.cli import resolve_drug_ids
 from core.exceptions import UnknownDrugError
 
+pytestmark = pytest.mark.integration
 
-def test_unknown_drug_has_suggestions_for_close_match():
-    conn = connect(DB_PATH)
 
+def test_unknown_drug_has_suggestions_for_close_match(db_conn):
     # Intentionally misspell a seeded drug. "quetiapine" is in your seed set.
     with pytest.raises(UnknownDrugError) as exc:
-        resolve_drug_ids(conn, ["quetiaipne"])
+        resolve_drug_ids(db_conn, ["quetiaipne"])
 
     err = exc.value
     assert "quetiaipne" in err.unknown
@@ -19,21 +19,17 @@ def test_unknown_drug_has_suggestions_for_close_match():
     assert "quetiapine" in err.suggestions.get("quetiaipne", ())
 
 
-def test_unknown_drug_may_have_no_suggestions_for_gibberish():
-    conn = connect(DB_PATH)
-
+def test_unknown_drug_may_have_no_suggestions_for_gibberish(db_conn):
     with pytest.raises(UnknownDrugError) as exc:
-        resolve_drug_ids(conn, ["xqznotadrug"])
+        resolve_drug_ids(db_conn, ["xqznotadrug"])
 
     err = exc.value
     assert "xqznotadrug" in err.unknown
     assert err.suggestions.get("xqznotadrug", ()) == ()
 
-def test_unknown_drug_suggestions_normalize_common_separators():
-    conn = connect(DB_PATH)
-
+def test_unknown_drug_suggestions_normalize_common_separators(db_conn):
     with pytest.raises(UnknownDrugError) as exc:
-        resolve_drug_ids(conn, ["wellbutrinn-xl"])
+        resolve_drug_ids(db_conn, ["wellbutrinn-xl"])
 
     err = exc.value
     assert "wellbutrin xl" in err.suggestions.get("wellbutrinn-xl", ())
\ No newline at end of file
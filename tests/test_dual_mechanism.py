@@ -3,42 +3,55 @@ from __future__ import annotations
 from core.enums import Domain, RuleClass, Severity
 from core.models import Facts, RuleHit
 from rules.composite_rules import apply_pk_dual_mechanism
+from tests.helpers import hits_by_id
 
 
-def test_dual_mechanism_increase_adds_composite_hit_and_uses_max_severity():
-    facts = Facts()
-
-    # CYP exposure increase hit (enzyme_id present)
-    h1 = RuleHit(
-        rule_id="PK_CYP3A4_STRONG_INHIB",
-        name="CYP inhibition increases exposure",
+def _increase_hit(
+    rule_id: str,
+    name: str,
+    severity: Severity,
+    rule_class: RuleClass,
+    **extra_inputs: str,
+) -> RuleHit:
+    """PK exposure-increase hit for the tacrolimus/clarithromycin pair."""
+    return RuleHit(
+        rule_id=rule_id,
+        name=name,
         domain=Domain.PK,
-        severity=Severity.major,
-        rule_class=RuleClass.adjust_monitor,
-        inputs={"A": "tacrolimus", "B": "clarithromycin", "enzyme_id": "CYP3A4"},
+        severity=severity,
+        rule_class=rule_class,
+        inputs={"A": "tacrolimus", "B": "clarithromycin", **extra_inputs},
         tags=["exposure_increase"],
         rationale=[],
         actions=[],
         references=[],
     )
 
+
+def test_dual_mechanism_increase_adds_composite_hit_and_uses_max_severity():
+    facts = Facts()
+
+    # CYP exposure increase hit (enzyme_id present)
+    h1 = _increase_hit(
+        "PK_CYP3A4_STRONG_INHIB",
+        "CYP inhibition increases exposure",
+        Severity.major,
+        RuleClass.adjust_monitor,
+        enzyme_id="CYP3A4",
+    )
+
     # P-gp exposure increase hit (transporter_id == P-gp)
-    h2 = RuleHit(
-        rule_id="PK_PGP_INHIB_TACROLIMUS",
-        name="P-gp inhibition increases exposure",
-        domain=Domain.PK,
-        severity=Severity.caution,
-        rule_class=RuleClass.caution,
-        inputs={"A": "tacrolimus", "B": "clarithromycin", "transporter_id": "P-gp"},
-        tags=["exposure_increase"],
-        rationale=[],
-        actions=[],
-        references=[],
+    h2 = _increase_hit(
+        "PK_PGP_INHIB_TACROLIMUS",
+        "P-gp inhibition increases exposure",
+        Severity.caution,
+        RuleClass.caution,
+        transporter_id="P-gp",
     )
 
     out = apply_pk_dual_mechanism(facts, [h1, h2])
 
-    dual = [h for h in out if h.rule_id == "PK_DUAL_MECH_INCREASE"]
+    dual = hits_by_id(out).get("PK_DUAL_MECH_INCREASE", [])
     assert len(dual) == 1
 
     dh = dual[0]
@@ -1,203 +1,98 @@
 from __future__ import annotations
 
-from app.cli import DB_PATH, RULE_DIR, connect, load_facts, resolve_drug_ids
-from rules.engine import evaluate_all, load_rules
+import pytest
+
+from rules.engine import evaluate_all
+from tests.helpers import cached_facts, hits_by_id, resolved_ids
+
+pytestmark = pytest.mark.integration
 
 
 def _rule_ids(hits):
     return {h.rule_id for h in hits}
 
-def _run(drugs: list[str]):
-    conn = connect(DB_PATH)
-    drug_ids = resolve_drug_ids(conn, drugs)
-    facts = load_facts(conn, drug_ids, patient_flags={})
-    rules = load_rules(RULE_DIR)
+def _run(conn, rules, drugs: list[str]):
+    drug_ids = resolved_ids(conn, drugs)
+    facts = cached_facts(conn, drug_ids)
     hits = evaluate_all(rules, facts, drug_ids)
     return facts, hits
 
 
-def test_pk_cyp3a4_strong_inhib_quetiapine_clarithro():
-    _, hits = _run(["quetiapine", "clarithromycin"])
-    assert any(
-        h.rule_id == "PK_CYP3A4_STRONG_INHIB" and h.inputs["A"] == "quetiapine"
-        for h in hits
-    )
-
-
-def test_pk_cyp3a4_strong_induc_midazolam_rifampin():
-    _, hits = _run(["midazolam", "rifampin"])
-    assert any(
-        h.rule_id == "PK_CYP3A4_STRONG_INDUC" and h.inputs["A"] == "midazolam"
-        for h in hits
-    )
-
-
-def test_pk_prodrug_activation_clopidogrel_fluconazole():
-    _, hits = _run(["clopidogrel", "fluconazole"])
-    assert any(
-        h.rule_id == "PK_CYP2C19_INHIB_CLOPIDOGREL" and h.inputs["A"] == "clopidogrel"
-        for h in hits
-    )
-
-
-def test_pk_pgp_digoxin_clarithro():
-    _, hits = _run(["digoxin", "clarithromycin"])
-    assert any(
-        h.rule_id == "PK_PGP_INHIB_DIGOXIN" and h.inputs["A"] == "digoxin" for h in hits
-    )
-
-
-def test_pd_qt_no_duplicates_citalopram_ondansetron():
-    _, hits = _run(["citalopram", "ondansetron"])
-    qt_hits = [h for h in hits if h.rule_id == "PD_QT_ADDITIVE"]
-    assert len(qt_hits) == 1
-
-
-def test_pk_bcrp_inhib_rosuvastatin_cyclosporine():
-    _, hits = _run(["rosuvastatin", "cyclosporine"])
+@pytest.mark.parametrize(
+    "drugs,expected_rule,expected_a",
+    [
+        (["quetiapine", "clarithromycin"], "PK_CYP3A4_STRONG_INHIB", "quetiapine"),
+        (["midazolam", "rifampin"], "PK_CYP3A4_STRONG_INDUC", "midazolam"),
+        # prodrug activation
+        (["clopidogrel", "fluconazole"], "PK_CYP2C19_INHIB_CLOPIDOGREL", "clopidogrel"),
+        (["digoxin", "clarithromycin"], "PK_PGP_INHIB_DIGOXIN", "digoxin"),
+        (["rosuvastatin", "cyclosporine"], "PK_BCRP_INHIB_SUBSTRATE", "rosuvastatin"),
+        (["rosuvastatin", "cyclosporine"], "PK_OATP_INHIB", "rosuvastatin"),
+        (["irinotecan", "atazanavir"], "PK_UGT1A1_INHIB", "irinotecan"),
+    ],
+)
+def test_pk_rule_fires_for_affected_drug(
+    db_conn, rules, drugs, expected_rule, expected_a
+):
+    _, hits = _run(db_conn, rules, drugs)
     assert any(
-        h.rule_id == "PK_BCRP_INHIB_SUBSTRATE" and h.inputs["A"] == "rosuvastatin"
-        for h in hits
+        h.inputs["A"] == expected_a for h in hits_by_id(hits).get(expected_rule, [])
     )
 
 
-def test_pk_oatp_inhib_rosuvastatin_cyclosporine():
-    _, hits = _run(["rosuvastatin", "cyclosporine"])
-    assert any(
-        h.rule_id == "PK_OATP_INHIB" and h.inputs["A"] == "rosuvastatin" for h in hits
-    )
+@pytest.mark.parametrize(
+    "drugs,expected_rule",
+    [
+        (["hydroxyzine", "paliperidone"], "PD_QT_ADDITIVE"),
+        (["citalopram", "ondansetron"], "PD_QT_ADDITIVE"),
+        (["lorazepam", "hydroxyzine"], "PD_CNS_DEP_ADDITIVE"),
+        (["lorazepam", "methocarbamol"], "PD_CNS_DEP_ADDITIVE"),
+        (["hydroxyzine", "olanzapine"], "PD_CNS_DEP_ADDITIVE"),
+        (["olanzapine", "methocarbamol"], "PD_CNS_DEP_ADDITIVE"),
+        (["doxepin", "hydroxyzine"], "PD_H1_ANTAGONISM_ADDITIVE"),
+        (["risperidone", "amitriptyline"], "PD_ALPHA1_ANTAGONISM_ADDITIVE"),
+        (["trazodone", "quetiapine"], "PD_ALPHA1_ANTAGONISM_ADDITIVE"),
+        (["methadone", "citalopram"], "PD_QT_PROLONGATION_ADDITIVE_HIGH"),
+        (["methadone", "erenumab"], "PD_CONSTIPATION_ADDITIVE_MEDIUM"),
+        (["fentanyl", "midazolam"], "PD_RESPIRATORY_DEPRESSION_ADDITIVE"),
+        (["mdma", "citalopram"], "PD_SEROTONIN_SYNDROME_ADDITIVE"),
+        (["ketamine", "alcohol"], "PD_SEDATION_ADDITIVE"),
+        (["varenicline", "vortioxetine"], "PD_NAUSEA_ADDITIVE"),
+        # named-pair PK rules
+        (["vibegron", "digoxin"], "PK_VIBEGRON_DIGOXIN"),
+        (["doxycycline", "warfarin"], "PK_DOXYCYCLINE_WARFARIN"),
+        (["doxycycline", "amoxicillin"], "PK_DOXYCYCLINE_AMOXICILLIN"),
+        (["doxycycline", "calcium carbonate"], "PK_DOXYCYCLINE_CALCIUM_CARBONATE"),
+        (["methadone", "fluoxetine"], "PK_METHADONE_FLUOXETINE"),
+        (["methadone", "carbamazepine"], "PK_METHADONE_CARBAMAZEPINE"),
+        (["lisdexamfetamine", "fluoxetine"], "PK_LISDEXAMFETAMINE_FLUOXETINE"),
+    ],
+)
+def test_rule_fires_for_pair(db_conn, rules, drugs, expected_rule):
+    _, hits = _run(db_conn, rules, drugs)
+    assert expected_rule in _rule_ids(hits)
 
 
-def test_pk_ugt1a1_inhib_irinotecan_atazanavir():
-    _, hits = _run(["irinotecan", "atazanavir"])
-    assert any(
-        h.rule_id == "PK_UGT1A1_INHIB" and h.inputs["A"] == "irinotecan" for h in hits
-    )
-
-def test_pd_qt_additive_hydroxyzine_paliperidone():
-    _, hits = _run(["hydroxyzine", "paliperidone"])
-    assert any(h.rule_id == "PD_QT_ADDITIVE" for h in hits)
-    
-def test_pd_qt_only_one_qt_rule_fires_per_pair():
-    _, hits = _run(["citalopram", "ondansetron"])
-    qt_hits = [
-        h for h in hits
-        if h.rule_id in {"PD_QT_ADDITIVE"}
-    ]
+def test_pd_qt_no_duplicates_citalopram_ondansetron(db_conn, rules):
+    _, hits = _run(db_conn, rules, ["citalopram", "ondansetron"])
+    qt_hits = hits_by_id(hits).get("PD_QT_ADDITIVE", [])
     assert len(qt_hits) == 1
-    
-def test_pd_qt_additive_citalopram_ondansetron():
-    _, hits = _run(["citalopram", "ondansetron"])
-    assert any(h.rule_id == "PD_QT_ADDITIVE" for h in hits)
-    
-def test_pd_cns_dep_additive_lorazepam_hydroxyzine():
-    _, hits = _run(["lorazepam", "hydroxyzine"])
-    assert any(h.rule_id == "PD_CNS_DEP_ADDITIVE" for h in hits)
-
 
-def test_pd_cns_dep_additive_lorazepam_methocarbamol():
-    _, hits = _run(["lorazepam", "methocarbamol"])
-    assert any(h.rule_id == "PD_CNS_DEP_ADDITIVE" for h in hits)
-
-
-def test_pd_cns_dep_additive_hydroxyzine_olanzapine():
-    _, hits = _run(["hydroxyzine", "olanzapine"])
-    assert any(h.rule_id == "PD_CNS_DEP_ADDITIVE" for h in hits)
-
-
-def test_pd_cns_dep_additive_olanzapine_methocarbamol():
-    _, hits = _run(["olanzapine", "methocarbamol"])
-    assert any(h.rule_id == "PD_CNS_DEP_ADDITIVE" for h in hits)
-    
-def test_pd_h1_antagonism_additive_doxepin_hydroxyzine():
-    _, hits = _run(["doxepin", "hydroxyzine"])
-    assert any(h.rule_id == "PD_H1_ANTAGONISM_ADDITIVE" for h in hits)
-    
-def test_pd_alpha1_antagonism_additive_risperidone_amitriptyline():
-    _, hits = _run(["risperidone", "amitriptyline"])
-    assert any(h.rule_id == "PD_ALPHA1_ANTAGONISM_ADDITIVE" for h in hits)
-    
-def test_pd_alpha1_antagonism_additive_trazodone_quetiapine():
-    _, hits = _run(["trazodone", "quetiapine"])
-    assert any(h.rule_id == "PD_ALPHA1_ANTAGONISM_ADDITIVE" for h in hits)
-
-def test_pd_qt_prolongation_additive_methadone_citalopram():
-    _, hits = _run(["methadone", "citalopram"])
-    assert any(h.rule_id == "PD_QT_PROLONGATION_ADDITIVE_HIGH" for h in hits)
-
-def test_pd_constipation_additive_methadone_erenumab():
-    _, hits = _run(["methadone", "erenumab"])
-    assert any(h.rule_id == "PD_CONSTIPATION_ADDITIVE_MEDIUM" for h in hits)
-
-
-def test_pk_vibegron_digoxin():
-    _, hits = _run(["vibegron", "digoxin"])
-    assert any(h.rule_id == "PK_VIBEGRON_DIGOXIN" for h in hits)
-
-
-def test_pk_doxycycline_warfarin():
-    _, hits = _run(["doxycycline", "warfarin"])
-    assert any(h.rule_id == "PK_DOXYCYCLINE_WARFARIN" for h in hits)
-
-
-def test_pk_doxycycline_amoxicillin():
-    _, hits = _run(["doxycycline", "amoxicillin"])
-    assert any(h.rule_id == "PK_DOXYCYCLINE_AMOXICILLIN" for h in hits)
-
-
-def test_pk_doxycycline_calcium_carbonate():
-    _, hits = _run(["doxycycline", "calcium carbonate"])
-    assert any(h.rule_id == "PK_DOXYCYCLINE_CALCIUM_CARBONATE" for h in hits)
-
-
-def test_pk_methadone_fluoxetine():
-    _, hits = _run(["methadone", "fluoxetine"])
-    assert any(h.rule_id == "PK_METHADONE_FLUOXETINE" for h in hits)
-
-
-def test_pk_methadone_carbamazepine():
-    _, hits = _run(["methadone", "carbamazepine"])
-    assert any(h.rule_id == "PK_METHADONE_CARBAMAZEPINE" for h in hits)
-
-
-def test_pk_lisdexamfetamine_fluoxetine():
-    _, hits = _run(["lisdexamfetamine", "fluoxetine"])
-    assert any(h.rule_id == "PK_LISDEXAMFETAMINE_FLUOXETINE" for h in hits)
-    
-def test_pd_respiratory_depression_fentanyl_midazolam():
-    _, hits = _run(["fentanyl", "midazolam"])
-    assert "PD_RESPIRATORY_DEPRESSION_ADDITIVE" in _rule_ids(hits)
-
-def test_pd_cns_depression_alcohol_clonazepam():
-    _, hits = _run(["alcohol", "clonazepam"])
+def test_pd_cns_depression_alcohol_clonazepam(db_conn, rules):
+    _, hits = _run(db_conn, rules, ["alcohol", "clonazepam"])
     rids = _rule_ids(hits)
     assert (
         "PD_CNS_DEPRESSION_ADDITIVE" in rids
         or "PD_CNS_DEPRESSION_ADDITIVE_HIGH" in rids
-)
+    )
     assert "PD_SEDATION_ADDITIVE" in rids
 
-def test_pd_serotonin_syndrome_mdma_citalopram():
-    _, hits = _run(["mdma", "citalopram"])
-    assert "PD_SEROTONIN_SYNDROME_ADDITIVE" in _rule_ids(hits)
-
-def test_pd_cns_depression_ketamine_alcohol():
-    _, hits = _run(["ketamine", "alcohol"])
-    rids = _rule_ids(hits)
-    assert "PD_SEDATION_ADDITIVE" in rids
-    
-def test_pd_stimulation_cocaine_amphetamine():
-    _, hits = _run(["cocaine", "amphetamine_dextroamphetamine"])
+def test_pd_stimulation_cocaine_amphetamine(db_conn, rules):
+    _, hits = _run(db_conn, rules, ["cocaine", "amphetamine_dextroamphetamine"])
     rids = _rule_ids(hits)
     assert len(rids) > 0
 
-def test_pd_tachycardia_methamphetamine_amphetamine():
-    _, hits = _run(["methamphetamine", "amphetamine_dextroamphetamine"])
+def test_pd_tachycardia_methamphetamine_amphetamine(db_conn, rules):
+    _, hits = _run(db_conn, rules, ["methamphetamine", "amphetamine_dextroamphetamine"])
     rids = _rule_ids(hits)
     assert len(rids) > 0
-
-def test_nausea_additive_varenicline_vortioxetine():
-    _, hits = _run(["varenicline", "vortioxetine"])
-    rids = _rule_ids(hits)
-
-    assert "PD_NAUSEA_ADDITIVE" in rids
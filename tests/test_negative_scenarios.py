@@ -7,15 +7,17 @@ could be tempting.
 
 from __future__ import annotations
 
-from app.cli import DB_PATH, RULE_DIR, connect, load_facts, resolve_drug_ids
-from rules.engine import evaluate_all, load_rules
+import pytest
 
+from rules.engine import evaluate_all
+from tests.helpers import cached_facts, resolved_ids
 
-def _run(drugs: list[str]):
-    conn = connect(DB_PATH)
-    drug_ids = resolve_drug_ids(conn, drugs)
-    facts = load_facts(conn, drug_ids, patient_flags={})
-    rules = load_rules(RULE_DIR)
+pytestmark = pytest.mark.integration
+
+
+def _run(conn, rules, drugs: list[str]):
+    drug_ids = resolved_ids(conn, drugs)
+    facts = cached_facts(conn, drug_ids)
     hits = evaluate_all(rules, facts, drug_ids)
     return facts, hits
 
@@ -24,132 +26,84 @@ def _rule_ids(hits):
     return {h.rule_id for h in hits}
 
 
-def test_negative_no_interaction_midazolam_fluconazole():
-    """Fluconazole is not a CYP3A4 strong inhibitor in seed data; no PD overlap either."""
-    _, hits = _run(["midazolam", "fluconazole"])
-    assert hits == []
-
-
-def test_negative_no_interaction_clopidogrel_clarithromycin():
-    """Clarithromycin should not be treated as a CYP2C19 inhibitor for clopidogrel activation."""
-    _, hits = _run(["clopidogrel", "clarithromycin"])
-    assert hits == []
-
-
-def test_negative_no_interaction_warfarin_clarithromycin():
-    """Clarithromycin should not trip the CYP2C9 inhibition warfarin rule in current seed data."""
-    _, hits = _run(["warfarin", "clarithromycin"])
-    assert hits == []
-
-
-def test_negative_no_interaction_digoxin_fluconazole():
-    """Digoxin is a P-gp substrate, but fluconazole is not a P-gp inhibitor/inducer in seed data."""
-    _, hits = _run(["digoxin", "fluconazole"])
-    assert hits == []
-
-
-def test_negative_no_qt_hit_citalopram_sertraline():
-    """Only citalopram has QT liability in seed data; this pair can still be serotonergic."""
-    _, hits = _run(["citalopram", "sertraline"])
-    assert "PD_QT_ADDITIVE" not in _rule_ids(hits)
-
-
-def test_negative_no_bradycardia_hit_propranolol_tizanidine():
-    """Only propranolol has bradycardia liability in seed data."""
-    _, hits = _run(["propranolol", "tizanidine"])
-    assert "PD_BRADYCARDIA_ADDITIVE" not in _rule_ids(hits)
-    assert hits == []
-
-
-def test_negative_desvenlafaxine_not_serotonergic_overlap():
-    """Desvenlafaxine is modeled under serotonin_syndrome (not serotonergic overlap) in seed."""
-    _, hits = _run(["desvenlafaxine", "sertraline"])
-    rids = _rule_ids(hits)
-    assert "PD_SEROTONIN_SYNDROME_ADDITIVE" in rids
-    assert "PD_SEROTONERGIC_ADDITIVE" not in rids
-
-
-def test_negative_no_cyp3a4_strong_inhib_quetiapine_fluconazole():
-    """Quetiapine is CYP3A4 substrate, but fluconazole is not a strong CYP3A4 inhibitor in seed."""
-    _, hits = _run(["quetiapine", "fluconazole"])
+@pytest.mark.parametrize(
+    "drugs",
+    [
+        # Fluconazole is not a CYP3A4 strong inhibitor in seed data; no PD overlap either.
+        ["midazolam", "fluconazole"],
+        # Clarithromycin should not be treated as a CYP2C19 inhibitor for clopidogrel activation.
+        ["clopidogrel", "clarithromycin"],
+        # Clarithromycin should not trip the CYP2C9 inhibition warfarin rule in current seed data.
+        ["warfarin", "clarithromycin"],
+        # Digoxin is a P-gp substrate, but fluconazole is not a P-gp inhibitor/inducer in seed data.
+        ["digoxin", "fluconazole"],
+        # Only propranolol has bradycardia liability in seed data.
+        ["propranolol", "tizanidine"],
+        # Quetiapine is CYP3A4 substrate, but fluconazole is not a strong CYP3A4 inhibitor in seed.
+        ["quetiapine", "fluconazole"],
+    ],
+)
+def test_negative_no_hits_at_all(db_conn, rules, drugs):
+    _, hits = _run(db_conn, rules, drugs)
     assert hits == []
 
 
-def test_negative_pgp_induction_not_inhibition_digoxin_rifampin():
-    """Rifampin should induce (not inhibit) P-gp for digoxin in seed data."""
-    _, hits = _run(["digoxin", "rifampin"])
-    rids = _rule_ids(hits)
-    assert "PK_PGP_INDUC_DIGOXIN" in rids
-    assert "PK_PGP_INHIB_DIGOXIN" not in rids
-
-
-def test_negative_cyp3a4_induction_not_inhibition_midazolam_rifampin():
-    """Rifampin should induce (not inhibit) CYP3A4 for midazolam in seed data."""
-    _, hits = _run(["midazolam", "rifampin"])
+@pytest.mark.parametrize(
+    "drugs,forbidden_rule",
+    [
+        # Only citalopram has QT liability in seed data; this pair can still be serotonergic.
+        (["citalopram", "sertraline"], "PD_QT_ADDITIVE"),
+        # Fluconazole should not be treated as a BCRP inhibitor in seed data.
+        (["rosuvastatin", "fluconazole"], "PK_BCRP_INHIB_SUBSTRATE"),
+        # Fluconazole is not modeled as an OATP inhibitor in seed data.
+        (["rosuvastatin", "fluconazole"], "PK_OATP_INHIB"),
+        # CNS-depression additive should not fire for low-magnitude overlap.
+        (["paliperidone", "hydroxyzine"], "PD_CNS_DEP_ADDITIVE"),
+        (["sertraline", "gabapentin"], "PD_ALPHA1_ANTAGONISM_ADDITIVE"),
+        (["warfarin", "clarithromycin"], "PD_ALPHA1_ANTAGONISM_ADDITIVE"),
+        (["clonazepam", "zolpidem"], "PD_ACTIVATION_AGITATION_ADDITIVE"),
+        (["clonidine", "guanfacine"], "PD_ACTIVATION_AGITATION_ADDITIVE"),
+        (["clonazepam", "zolpidem"], "PD_INSOMNIA_ADDITIVE"),
+        (["clonidine", "guanfacine"], "PD_INSOMNIA_ADDITIVE"),
+        (["lsd", "sertraline"], "PD_SEROTONIN_SYNDROME_ADDITIVE"),
+        (["cannabis", "sertraline"], "PD_RESPIRATORY_DEPRESSION_ADDITIVE"),
+        (["nicotine", "citalopram"], "PD_QT_ADDITIVE"),
+        (["cocaine", "citalopram"], "PD_SEROTONERGIC_ADDITIVE"),
+        (["nicotine", "methylphenidate"], "PD_RESPIRATORY_DEPRESSION_ADDITIVE"),
+    ],
+)
+def test_negative_rule_does_not_fire(db_conn, rules, drugs, forbidden_rule):
+    _, hits = _run(db_conn, rules, drugs)
+    assert forbidden_rule not in _rule_ids(hits)
+
+
+@pytest.mark.parametrize(
+    "drugs,required_rule,forbidden_rule",
+    [
+        # Desvenlafaxine is modeled under serotonin_syndrome (not serotonergic overlap) in seed.
+        (
+            ["desvenlafaxine", "sertraline"],
+            "PD_SEROTONIN_SYNDROME_ADDITIVE",
+            "PD_SEROTONERGIC_ADDITIVE",
+        ),
+        # Rifampin should induce (not inhibit) P-gp for digoxin in seed data.
+        (
+            ["digoxin", "rifampin"],
+            "PK_PGP_INDUC_DIGOXIN",
+            "PK_PGP_INHIB_DIGOXIN",
+        ),
+        # Rifampin should induce (not inhibit) CYP3A4 for midazolam in seed data.
+        (
+            ["midazolam", "rifampin"],
+            "PK_CYP3A4_STRONG_INDUC",
+            "PK_CYP3A4_STRONG_INHIB",
+        ),
+    ],
+)
+def test_negative_right_rule_not_wrong_rule(
+    db_conn, rules, drugs, required_rule, forbidden_rule
+):
+    _, hits = _run(db_conn, rules, drugs)
     rids = _rule_ids(hits)
-    assert "PK_CYP3A4_STRONG_INDUC" in rids
-    assert "PK_CYP3A4_STRONG_INHIB" not in rids
-
-
-def test_negative_no_bcrp_hit_rosuvastatin_fluconazole():
-    """Fluconazole should not be treated as a BCRP inhibitor in seed data."""
-    _, hits = _run(["rosuvastatin", "fluconazole"])
-    assert "PK_BCRP_INHIB_SUBSTRATE" not in _rule_ids(hits)
-
-
-def test_negative_no_oatp_hit_rosuvastatin_fluconazole():
-    """Fluconazole is not modeled as an OATP inhibitor in seed data."""
-    _, hits = _run(["rosuvastatin", "fluconazole"])
-    assert "PK_OATP_INHIB" not in _rule_ids(hits)
-
-def test_pd_cns_dep_additive_does_not_fire_for_low_magnitude():
-    _, hits = _run(["paliperidone", "hydroxyzine"])
-    assert all(h.rule_id != "PD_CNS_DEP_ADDITIVE" for h in hits)
-    
-def test_pd_alpha1_antagonism_not_triggered_sertraline_gabapentin():
-    _, hits = _run(["sertraline", "gabapentin"])
-    assert all(h.rule_id != "PD_ALPHA1_ANTAGONISM_ADDITIVE" for h in hits)
-
-def test_pd_alpha1_antagonism_not_triggered_warfarin_clarithromycin():
-    _, hits = _run(["warfarin", "clarithromycin"])
-    assert all(h.rule_id != "PD_ALPHA1_ANTAGONISM_ADDITIVE" for h in hits) 
-    
-def test_negative_no_activation_agitation_hit_clonazepam_zolpidem():
-    _, hits = _run(["clonazepam", "zolpidem"])
-    assert "PD_ACTIVATION_AGITATION_ADDITIVE" not in _rule_ids(hits)
-
-
-def test_negative_no_activation_agitation_hit_clonidine_guanfacine():
-    _, hits = _run(["clonidine", "guanfacine"])
-    assert "PD_ACTIVATION_AGITATION_ADDITIVE" not in _rule_ids(hits)
-
-
-def test_negative_no_insomnia_hit_clonazepam_zolpidem():
-    _, hits = _run(["clonazepam", "zolpidem"])
-    assert "PD_INSOMNIA_ADDITIVE" not in _rule_ids(hits)
-
-
-def test_negative_no_insomnia_hit_clonidine_guanfacine():
-    _, hits = _run(["clonidine", "guanfacine"])
-    assert "PD_INSOMNIA_ADDITIVE" not in _rule_ids(hits)
-
-def test_negative_no_serotonin_syndrome_lsd_sertraline():
-    _, hits = _run(["lsd", "sertraline"])
-    assert "PD_SEROTONIN_SYNDROME_ADDITIVE" not in _rule_ids(hits)
-
-def test_negative_no_respiratory_depression_cannabis_sertraline():
-    _, hits = _run(["cannabis", "sertraline"])
-    assert "PD_RESPIRATORY_DEPRESSION_ADDITIVE" not in _rule_ids(hits)
-
-def test_negative_no_qt_hit_nicotine_citalopram():
-    _, hits = _run(["nicotine", "citalopram"])
-    assert "PD_QT_ADDITIVE" not in _rule_ids(hits)
-
-def test_negative_no_serotonergic_cocaine_citalopram():
-    _, hits = _run(["cocaine", "citalopram"])
-    assert "PD_SEROTONERGIC_ADDITIVE" not in _rule_ids(hits)
-
-def test_negative_no_respiratory_depression_nicotine_methylphenidate():
-    _, hits = _run(["nicotine", "methylphenidate"])
-    assert "PD_RESPIRATORY_DEPRESSION_ADDITIVE" not in _rule_ids(hits)
-        
+    assert required_rule in rids
+    assert forbidden_rule not in rids
@@ -1,22 +1,23 @@
 from __future__ import annotations
 
-from app.cli import DB_PATH, RULE_DIR, connect, load_facts, resolve_drug_ids
+import pytest
+
 from core.enums import Domain, RuleClass, Severity
 from core.models import Facts, RuleHit
 from reasoning.combine import build_pair_reports
-from rules.engine import evaluate_all, load_rules
+from rules.engine import evaluate_all
+from tests.helpers import cached_facts, resolved_ids
+
+pytestmark = pytest.mark.integration
 
 
-def test_pk_summary_exposure_increase_digoxin_verapamil():
-    conn = connect(DB_PATH)
-    drug_ids = resolve_drug_ids(conn, ["digoxin", "verapamil"])
-    facts = load_facts(conn, drug_ids, patient_flags={})
+def test_pk_summary_exposure_increase_digoxin_verapamil(db_conn, rules, rule_templates):
+    drug_ids = resolved_ids(db_conn, ["digoxin", "verapamil"])
+    facts = cached_facts(db_conn, drug_ids)
 
-    rules = load_rules(RULE_DIR)
     hits = evaluate_all(rules, facts, drug_ids)
 
-    templates = {r.id: r.explanation_template for r in rules}
-    reports = build_pair_reports(facts, hits, templates)
+    reports = build_pair_reports(facts, hits, rule_templates)
 
     assert reports
     rep = reports[0]
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-from app.cli import DB_PATH, RULE_DIR, connect, load_facts, resolve_drug_ids
-from rules.engine import evaluate_all, load_rules
+import pytest
 
+from rules.engine import evaluate_all
+from tests.helpers import cached_facts, resolved_ids
 
-def test_transporter_family_rule_matches_pgp_roles():
-    conn = connect(DB_PATH)
-    drug_ids = resolve_drug_ids(conn, ["digoxin", "verapamil"])
-    facts = load_facts(conn, drug_ids, patient_flags={})
+pytestmark = pytest.mark.integration
 
-    rules = load_rules(RULE_DIR)
+
+def test_transporter_family_rule_matches_pgp_roles(db_conn, rules):
+    drug_ids = resolved_ids(db_conn, ["digoxin", "verapamil"])
+    facts = cached_facts(db_conn, drug_ids)
     hits = evaluate_all(rules, facts, drug_ids)
 
     assert any(h.rule_id == "PK_PGP_INHIB_DIGOXIN" for h in hits)